@@ -0,0 +1,148 @@
+"""Parsing of exported Safari (Netscape bookmark format) HTML files into bookmark rows"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from logging import getLogger
+from pathlib import Path
+from typing import Optional
+
+from sqlmodel import Session, func, select
+
+from app.bulk import bulk_create_bookmark_columns
+from app.database import get_worker_session
+from app.models import Bookmark, BookmarkUpload
+
+logger = getLogger(__name__)
+
+FOLDER_SEPARATOR = " > "
+
+# Column limits of Bookmark; values are truncated while parsing so inserts need no per-row validation
+TITLE_MAX_LENGTH = 500
+URL_MAX_LENGTH = 2000
+FOLDER_PATH_MAX_LENGTH = 1000
+
+_SUPPORTED_SCHEMES = ("http://", "https://")
+
+
+@dataclass
+class ParsedBookmarks:
+    """Parsed bookmarks as parallel column lists; index ``i`` of every list describes one bookmark"""
+
+    titles: list[str] = field(default_factory=list)
+    urls: list[str] = field(default_factory=list)
+    folder_paths: list[Optional[str]] = field(default_factory=list)
+    dates_added: list[Optional[datetime]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
+class _BookmarkHTMLParser(HTMLParser):
+    """Walks nested <DL> folders and collects every <A HREF> with its folder path"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.bookmarks = ParsedBookmarks()
+        self._folders: list[Optional[str]] = []
+        # Joined once per folder change and shared by every bookmark inside it
+        self._folder_path: Optional[str] = None
+        self._pending_folder: Optional[str] = None
+        self._in_folder_title = False
+        self._href: Optional[str] = None
+        self._add_date: Optional[datetime] = None
+        self._title_parts: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        match tag:
+            case "h3":
+                self._in_folder_title = True
+                self._pending_folder = ""
+            case "dl":
+                # A <DL> opens the folder whose <H3> preceded it; the root list has no title
+                self._folders.append(self._pending_folder or None)
+                self._pending_folder = None
+                self._update_folder_path()
+            case "a":
+                attributes = dict(attrs)
+                self._href = (attributes.get("href") or "").strip()
+                self._add_date = _parse_add_date(attributes.get("add_date"))
+                self._title_parts = []
+
+    def handle_endtag(self, tag: str) -> None:
+        match tag:
+            case "h3":
+                self._in_folder_title = False
+            case "dl" if self._folders:
+                self._folders.pop()
+                self._update_folder_path()
+            case "a" if self._href is not None:
+                self._add_bookmark()
+                self._href = None
+
+    def handle_data(self, data: str) -> None:
+        if self._in_folder_title:
+            self._pending_folder = (self._pending_folder or "") + data.strip()
+        elif self._href is not None:
+            self._title_parts.append(data)
+
+    def _update_folder_path(self) -> None:
+        folder_path = FOLDER_SEPARATOR.join(folder for folder in self._folders if folder)
+        self._folder_path = folder_path[:FOLDER_PATH_MAX_LENGTH] if folder_path else None
+
+    def _add_bookmark(self) -> None:
+        url = self._href or ""
+        if not url.startswith(_SUPPORTED_SCHEMES):
+            return
+        title = " ".join("".join(self._title_parts).split()) or url
+        self.bookmarks.titles.append(title[:TITLE_MAX_LENGTH])
+        self.bookmarks.urls.append(url[:URL_MAX_LENGTH])
+        self.bookmarks.folder_paths.append(self._folder_path)
+        self.bookmarks.dates_added.append(self._add_date)
+
+
+def _parse_add_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromtimestamp(int(value), timezone.utc).replace(tzinfo=None)
+    except (ValueError, OverflowError, OSError):
+        logger.debug(f"Ignoring invalid ADD_DATE {value}")
+        return None
+
+
+def parse_bookmarks_html(html: str) -> ParsedBookmarks:
+    """Extract http(s) bookmarks with their folder hierarchy from an exported bookmarks file"""
+    parser = _BookmarkHTMLParser()
+    parser.feed(html)
+    parser.close()
+    return parser.bookmarks
+
+
+def import_bookmarks(session: Session, upload: BookmarkUpload, html: str) -> int:
+    """Parse an upload's HTML and bulk insert its bookmarks.
+
+    Bookmarks already stored for the upload are skipped, so re-importing is safe. Returns the number of
+    bookmarks newly inserted; ``total_bookmarks`` is set to the upload's full count.
+    """
+    if upload.id is None:
+        raise ValueError("Upload must be persisted before importing bookmarks")
+    parsed = parse_bookmarks_html(html)
+    inserted = bulk_create_bookmark_columns(
+        session, upload.id, parsed.titles, parsed.urls, parsed.folder_paths, parsed.dates_added
+    )
+    upload.total_bookmarks = session.exec(
+        select(func.count()).select_from(Bookmark).where(Bookmark.upload_id == upload.id)
+    ).one()
+    session.add(upload)
+    return inserted
+
+
+def import_upload(upload_id: int) -> int:
+    """Read the uploaded file from disk and import its bookmarks in a single transaction"""
+    with get_worker_session() as session, session.begin():
+        upload = session.get(BookmarkUpload, upload_id)
+        if upload is None:
+            raise ValueError(f"Upload {upload_id} not found")
+        html = Path(upload.file_path).read_text(encoding="utf-8", errors="replace")
+        return import_bookmarks(session, upload, html)
@@ -0,0 +1,444 @@
+"""Concurrent extraction and summarization of the bookmarks in an upload"""
+
+import asyncio
+import hashlib
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from logging import getLogger
+from typing import Callable, Optional, cast
+
+import httpx
+from sqlalchemy import CursorResult, func, insert, update
+from sqlmodel import Session, select
+
+from app.bulk import reset_stale_bookmarks
+from app.database import SQLALCHEMY_COMMIT_EVERY, get_worker_session
+from app.logging_queue import enqueue_processing_log
+from app.models import (
+    Bookmark,
+    BookmarkStatus,
+    BookmarkUpload,
+    ContentExtractionStatus,
+    ExtractedContent,
+    ExtractedContentCreate,
+    ProcessingLogCreate,
+)
+
+logger = getLogger(__name__)
+
+MAX_CONCURRENT_BOOKMARKS = 32
+STATUS_FLUSH_EVERY = 50
+FETCH_TIMEOUT_SECONDS = 15.0
+# Larger pages are cut off; the leading part carries the title and headline content
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+RECENT_CONTENT_WINDOW = timedelta(hours=24)
+EXTRACTION_METHOD = "httpx+html.parser"
+
+_HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+_PROCESSED_STATUSES = (ContentExtractionStatus.COMPLETED, ContentExtractionStatus.FAILED)
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg"}
+_BLOCK_TAGS = {"p", "div", "li", "article", "section", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "br", "time"}
+_ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}))?")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class _PageTextParser(HTMLParser):
+    """Collects the title, visible text blocks and <time datetime> values of a page"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.blocks: list[str] = []
+        self.time_values: list[str] = []
+        self._current: list[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in _BLOCK_TAGS:
+            self._end_block()
+        if tag == "time":
+            value = dict(attrs).get("datetime")
+            if value:
+                self.time_values.append(value)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag in _BLOCK_TAGS:
+            self._end_block()
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth > 0:
+            return
+        if self._in_title:
+            self.title = (self.title or "") + data.strip()
+            return
+        self._current.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_block()
+
+    def _end_block(self) -> None:
+        text = " ".join("".join(self._current).split())
+        if text:
+            self.blocks.append(text)
+        self._current = []
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    match = _ISO_DATE_RE.search(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0))
+    except ValueError:
+        logger.debug(f"Ignoring invalid date {match.group(0)}")
+        return None
+
+
+def filter_recent_content(
+    blocks: list[str], time_values: list[str], now: datetime
+) -> tuple[Optional[str], Optional[datetime]]:
+    """Keep only text blocks dated within the recent-content window.
+
+    Returns the filtered text (None when nothing is recent) and the latest date found on the page.
+    """
+    cutoff = now - RECENT_CONTENT_WINDOW
+    dates = [date for date in (_parse_date(value) for value in time_values) if date is not None]
+    recent_blocks = []
+    for block in blocks:
+        block_dates = [date for date in (_parse_date(m.group(0)) for m in _ISO_DATE_RE.finditer(block)) if date]
+        dates.extend(block_dates)
+        if any(cutoff <= date <= now for date in block_dates):
+            recent_blocks.append(block)
+
+    content_date = max(dates) if dates else None
+    if not recent_blocks and content_date is not None and cutoff <= content_date <= now:
+        # Page-level <time> marks recent content but no block carries its own date
+        recent_blocks = blocks
+    return ("\n".join(recent_blocks) if recent_blocks else None), content_date
+
+
+def summarize_content(text: str, max_length: int = 2000) -> str:
+    """Extractive summary: leading sentences of the text, bounded to the summary column length"""
+    summary = ""
+    for sentence in _SENTENCE_END_RE.split(text.replace("\n", " ")):
+        candidate = f"{summary} {sentence}".strip()
+        if len(candidate) > max_length:
+            break
+        summary = candidate
+        if len(summary) >= max_length // 4:
+            break
+    return summary or text[:max_length]
+
+
+class _UnsupportedContent(Exception):
+    """The response is not an HTML page"""
+
+
+async def _fetch_html(client: httpx.AsyncClient, url: str, max_bytes: int) -> tuple[str, str, int, bool]:
+    """GET a page, reading at most ``max_bytes`` of an HTML body.
+
+    Returns the decoded text, the final URL, the status code and whether the body was truncated.
+    """
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in _HTML_CONTENT_TYPES:
+            raise _UnsupportedContent(f"Unsupported content type {content_type}")
+        body = bytearray()
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                del body[max_bytes:]
+                truncated = True
+                break
+        text = body.decode(response.encoding or "utf-8", errors="replace")
+        return text, str(response.url), response.status_code, truncated
+
+
+def _extract_content(
+    bookmark_id: int, html: str, final_url: str, status_code: int, truncated: bool, page_load_time: float
+) -> ExtractedContentCreate:
+    parser = _PageTextParser()
+    # PostgreSQL text cannot hold NUL characters; drop them before they reach title or content
+    parser.feed(html.replace("\x00", ""))
+    parser.close()
+    filtered_content, content_date = filter_recent_content(
+        parser.blocks, parser.time_values, datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    return ExtractedContentCreate(
+        bookmark_id=bookmark_id,
+        page_title=parser.title[:500] if parser.title else None,
+        page_url=final_url[:2000],
+        raw_content="\n".join(parser.blocks),
+        filtered_content=filtered_content,
+        content_date=content_date,
+        content_metadata={"status_code": status_code, "block_count": len(parser.blocks), "truncated": truncated},
+        has_recent_content=filtered_content is not None,
+        extraction_method=EXTRACTION_METHOD,
+        page_load_time=round(page_load_time, 3),
+    )
+
+
+async def process_one(
+    client: httpx.AsyncClient, bookmark_id: int, url: str, max_bytes: int = MAX_RESPONSE_BYTES
+) -> tuple[int, Optional[ExtractedContentCreate], Optional[str], float]:
+    """Run extract -> filter -> summarize for a single bookmark without touching the database.
+
+    Never raises for a bad page: any failure is returned as an error message.
+    Returns the bookmark id, the extracted content (None on failure), an error message and the elapsed seconds.
+    """
+    started = time.perf_counter()
+    try:
+        html, final_url, status_code, truncated = await _fetch_html(client, url, max_bytes)
+        content = _extract_content(bookmark_id, html, final_url, status_code, truncated, time.perf_counter() - started)
+    except (httpx.HTTPError, httpx.InvalidURL, _UnsupportedContent) as e:
+        logger.info(f"Failed to fetch bookmark {bookmark_id} ({url}): {e}")
+        return bookmark_id, None, (str(e) or type(e).__name__)[:1000], time.perf_counter() - started
+    except Exception as e:
+        # One malformed page must not abort the rest of the upload
+        logger.exception(f"Failed to process bookmark {bookmark_id} ({url})")
+        return bookmark_id, None, f"{type(e).__name__}: {e}"[:1000], time.perf_counter() - started
+    return bookmark_id, content, None, time.perf_counter() - started
+
+
+def _recent_summaries_by_hash(session: Session, hashes: set[bytes]) -> dict[bytes, str]:
+    """Summaries already generated for identical page content within the recent-content window"""
+    rows = session.exec(
+        select(ExtractedContent.content_sha256, ExtractedContent.content_summary).where(
+            ExtractedContent.content_sha256.in_(hashes),  # type: ignore[union-attr]
+            ExtractedContent.content_summary.is_not(None),  # type: ignore[union-attr]
+            ExtractedContent.extraction_time > func.now() - RECENT_CONTENT_WINDOW,  # type: ignore[operator]
+        )
+    ).all()
+    return {content_hash: summary for content_hash, summary in rows if content_hash is not None and summary}
+
+
+def _flush_results(
+    session: Session,
+    upload_id: int,
+    results: list[tuple[int, Optional[ExtractedContentCreate], Optional[str], float]],
+    summarize: Callable[[str], str] = summarize_content,
+) -> list[ProcessingLogCreate]:
+    """Write a batch of finished bookmarks with a handful of set-based statements, without committing.
+
+    Returns the log entries to enqueue once the batch is committed.
+    """
+    now = datetime.now(timezone.utc)
+    completed = [content for _, content, _, _ in results if content is not None]
+    failed = [(bookmark_id, error) for bookmark_id, content, error, _ in results if content is None]
+
+    if completed:
+        rows = [content.model_dump() for content in completed]
+        for row in rows:
+            row["content_sha256"] = hashlib.sha256(row["raw_content"].encode("utf-8")).digest()
+        known_summaries = _recent_summaries_by_hash(session, {row["content_sha256"] for row in rows})
+        for row in rows:
+            if row["filtered_content"] is None:
+                continue
+            summary = known_summaries.get(row["content_sha256"])
+            if summary is None:
+                summary = summarize(row["filtered_content"])
+                known_summaries[row["content_sha256"]] = summary
+            row["content_summary"] = summary
+            row["summary_generated_at"] = now
+        session.execute(insert(ExtractedContent), rows)
+        session.execute(
+            update(Bookmark)
+            .where(Bookmark.id.in_([content.bookmark_id for content in completed]))  # type: ignore[union-attr]
+            .values(processing_status=ContentExtractionStatus.COMPLETED, processing_completed_at=now)
+        )
+    if failed:
+        # ORM bulk UPDATE by primary key: one executemany for per-row error messages
+        session.execute(
+            update(Bookmark),
+            [
+                {
+                    "id": bookmark_id,
+                    "processing_status": ContentExtractionStatus.FAILED,
+                    "processing_completed_at": now,
+                    "error_message": error,
+                }
+                for bookmark_id, error in failed
+            ],
+        )
+    # Counted rather than incremented: bookmarks requeued by bulk_retry would otherwise be counted twice.
+    # ix_bookmarks_upload_status answers this from the index.
+    processed = (
+        select(func.count())
+        .select_from(Bookmark)
+        .where(
+            Bookmark.upload_id == upload_id,  # type: ignore[arg-type]
+            Bookmark.processing_status.in_(_PROCESSED_STATUSES),  # type: ignore[attr-defined]
+        )
+        .scalar_subquery()
+    )
+    session.execute(
+        update(BookmarkUpload)
+        .where(BookmarkUpload.id == upload_id)  # type: ignore[arg-type]
+        .values(processed_bookmarks=processed)
+    )
+    return [
+        ProcessingLogCreate(
+            upload_id=upload_id,
+            bookmark_id=bookmark_id,
+            operation="process_bookmark",
+            status="completed" if content is not None else "failed",
+            duration_seconds=round(duration, 3),
+            error_details=error,
+        )
+        for bookmark_id, content, error, duration in results
+    ]
+
+
+def _start_processing(session: Session, upload_id: int) -> list[tuple[int, str]]:
+    """Claim the upload and its pending bookmarks. Returns (id, url) of every claimed bookmark.
+
+    Raises ValueError when the upload does not exist or another run is already processing it.
+    """
+    now = datetime.now(timezone.utc)
+    # Conditional UPDATE: of two concurrent runs on the same upload only one moves it to processing
+    claimed = session.execute(
+        update(BookmarkUpload)
+        .where(
+            BookmarkUpload.id == upload_id,  # type: ignore[arg-type]
+            BookmarkUpload.processing_status != BookmarkStatus.PROCESSING,  # type: ignore[arg-type]
+        )
+        .values(
+            processing_status=BookmarkStatus.PROCESSING,
+            processing_started_at=func.coalesce(BookmarkUpload.processing_started_at, now),
+        )
+    )
+    if cast(CursorResult, claimed).rowcount == 0:
+        session.rollback()
+        raise ValueError(f"Upload {upload_id} not found or already being processed")
+
+    pending = session.exec(
+        select(Bookmark.id, Bookmark.url).where(
+            Bookmark.upload_id == upload_id,
+            Bookmark.processing_status == ContentExtractionStatus.PENDING,
+        )
+    ).all()
+    bookmarks = [(bookmark_id, url) for bookmark_id, url in pending if bookmark_id is not None]
+    if bookmarks:
+        session.execute(
+            update(Bookmark)
+            .where(Bookmark.id.in_([bookmark_id for bookmark_id, _ in bookmarks]))  # type: ignore[union-attr]
+            .values(processing_status=ContentExtractionStatus.EXTRACTING, processing_started_at=now)
+        )
+    session.commit()
+    return bookmarks
+
+
+def _finish_processing(session: Session, upload_id: int) -> None:
+    """Mark the upload as completed, without committing"""
+    session.execute(
+        update(BookmarkUpload)
+        .where(BookmarkUpload.id == upload_id)  # type: ignore[arg-type]
+        .values(processing_status=BookmarkStatus.COMPLETED, processing_completed_at=datetime.now(timezone.utc))
+    )
+
+
+def _abort_processing(session: Session, upload_id: int, error: str) -> None:
+    """Discard the uncommitted batch, requeue the upload's in-flight bookmarks and mark the upload failed"""
+    session.rollback()
+    reset_stale_bookmarks(session, upload_id)
+    session.execute(
+        update(BookmarkUpload)
+        .where(BookmarkUpload.id == upload_id)  # type: ignore[arg-type]
+        .values(processing_status=BookmarkStatus.FAILED, error_message=error[:1000])
+    )
+    session.commit()
+
+
+async def _commit(session: Session, logs: list[ProcessingLogCreate]) -> None:
+    await asyncio.to_thread(session.commit)
+    # Only log work that is actually durable; enqueued from the event loop, as asyncio.Queue is not thread-safe
+    for entry in logs:
+        enqueue_processing_log(entry)
+    logs.clear()
+
+
+async def process_upload(
+    upload_id: int,
+    concurrency: int = MAX_CONCURRENT_BOOKMARKS,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    summarize: Callable[[str], str] = summarize_content,
+) -> int:
+    """Process all pending bookmarks of an upload concurrently.
+
+    Network work fans out over at most ``concurrency`` bookmarks at a time, while database writes
+    stay on a single session: results are written every ``STATUS_FLUSH_EVERY`` completions and
+    committed every ``SQLALCHEMY_COMMIT_EVERY``. Session work runs on a worker thread so the event
+    loop keeps serving fetches and the UI. Returns the number of bookmarks processed.
+    """
+    with get_worker_session() as session:
+        # asyncio.to_thread rather than run.io_bound: these writes must run even while the app shuts down
+        pending = await asyncio.to_thread(_start_processing, session, upload_id)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(client: httpx.AsyncClient, bookmark_id: int, url: str):
+            async with semaphore:
+                return await process_one(client, bookmark_id, url)
+
+        buffer: list[tuple[int, Optional[ExtractedContentCreate], Optional[str], float]] = []
+        uncommitted_logs: list[ProcessingLogCreate] = []
+        limits = httpx.Limits(max_connections=concurrency)
+        tasks: list[asyncio.Task] = []
+        try:
+            async with httpx.AsyncClient(
+                follow_redirects=True, timeout=FETCH_TIMEOUT_SECONDS, limits=limits, transport=transport
+            ) as client:
+                tasks = [asyncio.create_task(bounded(client, bookmark_id, url)) for bookmark_id, url in pending]
+                for finished in asyncio.as_completed(tasks):
+                    buffer.append(await finished)
+                    if len(buffer) >= STATUS_FLUSH_EVERY:
+                        uncommitted_logs.extend(
+                            await asyncio.to_thread(_flush_results, session, upload_id, buffer, summarize)
+                        )
+                        buffer = []
+                        if len(uncommitted_logs) >= SQLALCHEMY_COMMIT_EVERY:
+                            await _commit(session, uncommitted_logs)
+            if buffer:
+                uncommitted_logs.extend(await asyncio.to_thread(_flush_results, session, upload_id, buffer, summarize))
+
+            await asyncio.to_thread(_finish_processing, session, upload_id)
+            await _commit(session, uncommitted_logs)
+        except Exception as e:
+            # Without this the upload would stay "processing" and refuse every later run until a restart
+            logger.exception(f"Processing upload {upload_id} failed; requeueing its unfinished bookmarks")
+            for task in tasks:
+                task.cancel()
+            await asyncio.to_thread(_abort_processing, session, upload_id, f"{type(e).__name__}: {e}")
+            raise
+        return len(pending)
+
+
+def recover_interrupted_uploads() -> int:
+    """Requeue work left mid-pipeline by a previous process; run once at startup, before any processing.
+
+    Returns the number of uploads that were still marked as processing.
+    """
+    with get_worker_session() as session:
+        reset_stale_bookmarks(session)
+        result = session.execute(
+            update(BookmarkUpload)
+            .where(BookmarkUpload.processing_status == BookmarkStatus.PROCESSING)  # type: ignore[arg-type]
+            .values(processing_status=BookmarkStatus.PENDING)
+        )
+        session.commit()
+    return cast(CursorResult, result).rowcount
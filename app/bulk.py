@@ -0,0 +1,154 @@
+"""Bulk write helpers for high-volume tables"""
+
+import csv
+import io
+from contextlib import closing
+from datetime import datetime
+from typing import Optional, Sequence, cast
+
+import orjson
+from sqlalchemy import CursorResult, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session
+
+from app.database import BULK_INSERT_BATCH_SIZE
+from app.models import Bookmark, ContentExtractionStatus, ProcessingLog, ProcessingLogCreate
+
+# Below this many rows a multi-row INSERT is cheaper than setting up a COPY
+COPY_THRESHOLD = 100
+
+# timestamp is left to the column's server default
+_PROCESSING_LOG_COPY_COLUMNS = (
+    "upload_id",
+    "bookmark_id",
+    "operation",
+    "status",
+    "duration_seconds",
+    "details",
+    "error_details",
+)
+
+_IN_FLIGHT_STATUSES = (
+    ContentExtractionStatus.EXTRACTING,
+    ContentExtractionStatus.FILTERING,
+    ContentExtractionStatus.SUMMARIZING,
+)
+
+
+def _insert_new_bookmarks(session: Session, rows: list[dict]) -> int:
+    """Insert a page of bookmark rows, skipping any (upload_id, url) already present. Returns the number inserted."""
+    # Targets the uq_bm_upload_url_md5 expression index
+    statement = pg_insert(Bookmark).on_conflict_do_nothing(
+        index_elements=[Bookmark.upload_id, func.md5(Bookmark.url)]  # type: ignore[arg-type]
+    )
+    return len(session.execute(statement.returning(Bookmark.id), rows).all())  # type: ignore[arg-type]
+
+
+def bulk_create_bookmark_columns(
+    session: Session,
+    upload_id: int,
+    titles: Sequence[str],
+    urls: Sequence[str],
+    folder_paths: Sequence[Optional[str]],
+    dates_added: Sequence[Optional[datetime]],
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> int:
+    """Insert bookmarks given as parallel column lists, building insert dicts one page at a time.
+
+    URLs already stored for the upload are skipped via ON CONFLICT DO NOTHING, which makes re-importing the same
+    file idempotent. Returns the number of rows inserted. The caller owns the commit.
+    """
+    inserted = 0
+    for start in range(0, len(urls), batch_size):
+        end = start + batch_size
+        inserted += _insert_new_bookmarks(
+            session,
+            [
+                {"upload_id": upload_id, "title": title, "url": url, "folder_path": folder_path, "date_added": date}
+                for title, url, folder_path, date in zip(
+                    titles[start:end], urls[start:end], folder_paths[start:end], dates_added[start:end]
+                )
+            ],
+        )
+    return inserted
+
+
+def bulk_write_processing_logs(session: Session, rows: list[ProcessingLogCreate]) -> int:
+    """Append processing log rows, using PostgreSQL COPY for large batches.
+
+    Returns the number of rows written. The caller owns the commit.
+    """
+    if not rows:
+        return 0
+
+    if len(rows) < COPY_THRESHOLD or session.get_bind().dialect.name != "postgresql":
+        session.execute(insert(ProcessingLog), [row.model_dump() for row in rows])
+        return len(rows)
+
+    buffer = io.StringIO()
+    # QUOTE_NOTNULL leaves None unquoted so COPY reads it as NULL, while empty strings stay empty strings
+    writer = csv.writer(buffer, delimiter="\t", quoting=csv.QUOTE_NOTNULL)
+    for row in rows:
+        writer.writerow(
+            (
+                row.upload_id,
+                row.bookmark_id,
+                row.operation,
+                row.status,
+                row.duration_seconds,
+                orjson.dumps(row.details).decode(),
+                row.error_details,
+            )
+        )
+    buffer.seek(0)
+
+    columns = ", ".join(_PROCESSING_LOG_COPY_COLUMNS)
+    dbapi_connection = session.connection().connection
+    with closing(dbapi_connection.cursor()) as cursor:
+        cursor.copy_expert(
+            f"COPY {ProcessingLog.__tablename__} ({columns}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t')",
+            buffer,
+        )
+    return len(rows)
+
+
+def bulk_retry(session: Session, bookmark_ids: list[int]) -> int:
+    """Requeue failed bookmarks in a single UPDATE, bumping their retry_count.
+
+    Bookmarks that are not in the failed state are left alone. Returns the number of rows requeued.
+    The caller owns the commit.
+    """
+    if not bookmark_ids:
+        return 0
+    result = session.execute(
+        update(Bookmark)
+        .where(
+            Bookmark.id.in_(bookmark_ids),  # type: ignore[union-attr]
+            Bookmark.processing_status == ContentExtractionStatus.FAILED,  # type: ignore[arg-type]
+        )
+        .values(
+            retry_count=Bookmark.retry_count + 1,
+            processing_status=ContentExtractionStatus.PENDING,
+            processing_started_at=None,
+            processing_completed_at=None,
+            error_message=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return cast(CursorResult, result).rowcount
+
+
+def reset_stale_bookmarks(session: Session, upload_id: Optional[int] = None) -> int:
+    """Return bookmarks left mid-pipeline by an interrupted worker to pending in a single UPDATE.
+
+    Limited to one upload when ``upload_id`` is given. Returns the number of rows reset. The caller owns the commit.
+    """
+    statement = (
+        update(Bookmark)
+        .where(Bookmark.processing_status.in_(_IN_FLIGHT_STATUSES))  # type: ignore[attr-defined]
+        .values(processing_status=ContentExtractionStatus.PENDING, processing_started_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    if upload_id is not None:
+        statement = statement.where(Bookmark.upload_id == upload_id)  # type: ignore[arg-type]
+    return cast(CursorResult, session.execute(statement)).rowcount
@@ -0,0 +1,120 @@
+"""Non-blocking processing log writes: producers enqueue, a single background task flushes in batches"""
+
+import asyncio
+import threading
+from logging import getLogger
+from typing import Any, Callable
+
+import orjson
+import psycopg2
+from nicegui import background_tasks, run
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.bulk import bulk_write_processing_logs
+from app.database import get_worker_session
+from app.models import ProcessingLogCreate
+
+logger = getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 0.5
+FLUSH_BATCH_SIZE = 1000
+
+LOG_QUEUE: asyncio.Queue[ProcessingLogCreate] = asyncio.Queue()
+
+# Entries taken off LOG_QUEUE but not written yet; kept here so a shutdown flush still sees them
+_UNWRITTEN: list[ProcessingLogCreate] = []
+_WRITE_LOCK = threading.Lock()
+
+
+def _json_safe(details: dict[str, Any]) -> dict[str, Any]:
+    """details with values orjson cannot encode (Decimal, sets, ...) replaced by their string form"""
+    try:
+        return orjson.loads(orjson.dumps(details, default=str, option=orjson.OPT_NON_STR_KEYS))
+    except orjson.JSONEncodeError as e:
+        logger.warning(f"Dropping unserializable processing log details: {e}")
+        return {}
+
+
+def enqueue_processing_log(entry: ProcessingLogCreate, queue: asyncio.Queue[ProcessingLogCreate] = LOG_QUEUE) -> None:
+    """Queue a log entry for the background flusher; never blocks the caller.
+
+    details are checked here, so one unserializable value cannot fail a whole batch in the flusher.
+    """
+    try:
+        orjson.dumps(entry.details)
+    except orjson.JSONEncodeError:
+        logger.debug(f"Converting processing log details for {entry.operation} to JSON-safe values")
+        entry.details = _json_safe(entry.details)
+    queue.put_nowait(entry)
+
+
+def _write_batch(session_factory: Callable[[], Session], batch: list[ProcessingLogCreate]) -> None:
+    try:
+        with session_factory() as session:
+            bulk_write_processing_logs(session, batch)
+            session.commit()
+    except (SQLAlchemyError, psycopg2.Error) as e:
+        # Logs are best-effort; losing a batch must not stop the flusher. COPY errors come straight from psycopg2.
+        logger.error(f"Failed to write {len(batch)} processing logs: {e}")
+
+
+def _write_unwritten(session_factory: Callable[[], Session]) -> int:
+    """Write the entries collected so far. Safe to run on a worker thread while the loop keeps appending."""
+    with _WRITE_LOCK:
+        batch = list(_UNWRITTEN)
+        try:
+            _write_batch(session_factory, batch)
+        finally:
+            # Dropped even if the write raised, so one bad batch cannot fail every later flush.
+            # Entries appended during the write stay queued for the next call.
+            del _UNWRITTEN[: len(batch)]
+    return len(batch)
+
+
+async def log_flusher(
+    session_factory: Callable[[], Session] = get_worker_session,
+    queue: asyncio.Queue[ProcessingLogCreate] = LOG_QUEUE,
+    interval: float = FLUSH_INTERVAL_SECONDS,
+) -> None:
+    """Drain ``queue`` forever, writing every ``interval`` seconds or FLUSH_BATCH_SIZE entries"""
+    loop = asyncio.get_running_loop()
+    while True:
+        _UNWRITTEN.append(await queue.get())
+        deadline = loop.time() + interval
+        while len(_UNWRITTEN) < FLUSH_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                _UNWRITTEN.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                logger.debug(f"Flushing {len(_UNWRITTEN)} processing logs after {interval}s")
+                break
+        await run.io_bound(_write_unwritten, session_factory)
+
+
+def flush_pending_logs(
+    session_factory: Callable[[], Session] = get_worker_session,
+    queue: asyncio.Queue[ProcessingLogCreate] = LOG_QUEUE,
+) -> int:
+    """Synchronously write whatever is still queued or held by the flusher, e.g. on shutdown.
+
+    Returns the number of entries written.
+    """
+    written = 0
+    while True:
+        while len(_UNWRITTEN) < FLUSH_BATCH_SIZE and not queue.empty():
+            _UNWRITTEN.append(queue.get_nowait())
+        if not _UNWRITTEN:
+            return written
+        written += _write_unwritten(session_factory)
+
+
+def start_log_flusher() -> None:
+    background_tasks.create(log_flusher(), name="processing_log_flusher")
+
+
+def stop_log_flusher() -> None:
+    # Takes no arguments: NiceGUI passes the app to one-parameter shutdown handlers
+    flush_pending_logs()
@@ -1,8 +1,11 @@
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+from sqlmodel import SQLModel, Field, Relationship, JSON, Column, Index
+from sqlalchemy import TIMESTAMP, Double, Enum as SAEnum, LargeBinary, Text, TypeDecorator, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
 from enum import Enum
+import zlib
 
 
 class BookmarkStatus(str, Enum):
@@ -28,23 +31,86 @@ class SummaryJobStatus(str, Enum):
     FAILED = "failed"
 
 
+def _status_column_type(enum_cls: type[Enum]) -> SAEnum:
+    """Store status enums by value in a plain VARCHAR instead of a native database ENUM"""
+    return SAEnum(enum_cls, native_enum=False, values_callable=lambda e: [m.value for m in e], length=20)
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed in a binary column, transparently (de)compressed by SQLAlchemy"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), 6)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return zlib.decompress(value).decode("utf-8")
+
+
+def _created_at_field(description: str) -> Any:
+    """Non-null TIMESTAMPTZ filled in by the database with now() when the row is inserted"""
+    return Field(
+        default=None,
+        nullable=False,
+        sa_type=TIMESTAMP(timezone=True),  # type: ignore[arg-type]
+        sa_column_kwargs={"server_default": func.now()},
+        description=description,
+    )
+
+
+def _timestamp_field(description: Optional[str] = None) -> Any:
+    """Nullable TIMESTAMPTZ written by the application, comparable with the server-filled creation timestamps"""
+    return Field(
+        default=None,
+        sa_type=TIMESTAMP(timezone=True),  # type: ignore[arg-type]
+        description=description,
+    )
+
+
+# JSONB on PostgreSQL (binary, indexable); plain JSON elsewhere
+_JSON_TYPE = JSON().with_variant(JSONB(), "postgresql")
+
+# Large payload columns are mapped as deferred: they load on first attribute access or with undefer()
+_RAW_CONTENT_COLUMN = Column("raw_content_zlib", CompressedText, nullable=False)
+_FILTERED_CONTENT_COLUMN = Column("filtered_content", Text, nullable=True)
+_FINAL_SUMMARY_COLUMN = Column("final_summary", Text, nullable=True)
+
+
 # Persistent models (stored in database)
 class BookmarkUpload(SQLModel, table=True):
     """Represents an uploaded HTML bookmark file"""
 
     __tablename__ = "bookmark_uploads"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_uploads_status_time", "processing_status", "upload_time"),
+        # Partial index: only uploads still being worked on, a small slice of the table
+        Index(
+            "ix_uploads_active",
+            "upload_time",
+            postgresql_where=text("processing_status IN ('pending', 'processing')"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     filename: str = Field(max_length=255)
     file_path: str = Field(max_length=500)
     file_size: int = Field(description="File size in bytes")
-    upload_time: datetime = Field(default_factory=datetime.utcnow)
-    processing_status: BookmarkStatus = Field(default=BookmarkStatus.PENDING)
+    upload_time: Optional[datetime] = _created_at_field("When the file was uploaded")
+    processing_status: BookmarkStatus = Field(
+        default=BookmarkStatus.PENDING,
+        sa_type=_status_column_type(BookmarkStatus),  # type: ignore[arg-type]
+    )
     total_bookmarks: Optional[int] = Field(default=None, description="Total number of bookmarks found in file")
     processed_bookmarks: int = Field(default=0, description="Number of bookmarks processed")
     error_message: Optional[str] = Field(default=None, max_length=1000)
-    processing_started_at: Optional[datetime] = Field(default=None)
-    processing_completed_at: Optional[datetime] = Field(default=None)
+    processing_started_at: Optional[datetime] = _timestamp_field()
+    processing_completed_at: Optional[datetime] = _timestamp_field()
 
     bookmarks: List["Bookmark"] = Relationship(back_populates="upload")
     summary_jobs: List["SummaryJob"] = Relationship(back_populates="upload")
@@ -54,6 +120,14 @@ class Bookmark(SQLModel, table=True):
     """Individual bookmark extracted from uploaded file"""
 
     __tablename__ = "bookmarks"  # type: ignore[assignment]
+    __table_args__ = (
+        # Unique on a fixed-size hash: a btree entry on a long non-ASCII url can exceed PostgreSQL's row limit
+        Index("uq_bm_upload_url_md5", "upload_id", text("md5(url)"), unique=True),
+        Index("ix_bookmarks_upload_status", "upload_id", "processing_status"),
+        Index("ix_bookmarks_status_retry", "processing_status", "retry_count"),
+        # Partial index: the worker only looks for work, which is a small slice of a mostly completed table
+        Index("ix_bookmarks_pending", "upload_id", postgresql_where=text("processing_status IN ('pending', 'failed')")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     upload_id: int = Field(foreign_key="bookmark_uploads.id")
@@ -61,9 +135,12 @@ class Bookmark(SQLModel, table=True):
     url: str = Field(max_length=2000, description="Bookmark URL")
     folder_path: Optional[str] = Field(default=None, max_length=1000, description="Safari bookmark folder hierarchy")
     date_added: Optional[datetime] = Field(default=None, description="When bookmark was added to Safari")
-    processing_status: ContentExtractionStatus = Field(default=ContentExtractionStatus.PENDING)
-    processing_started_at: Optional[datetime] = Field(default=None)
-    processing_completed_at: Optional[datetime] = Field(default=None)
+    processing_status: ContentExtractionStatus = Field(
+        default=ContentExtractionStatus.PENDING,
+        sa_type=_status_column_type(ContentExtractionStatus),  # type: ignore[arg-type]
+    )
+    processing_started_at: Optional[datetime] = _timestamp_field()
+    processing_completed_at: Optional[datetime] = _timestamp_field()
     error_message: Optional[str] = Field(default=None, max_length=1000)
     retry_count: int = Field(default=0, description="Number of processing retries")
 
@@ -75,23 +152,39 @@ class ExtractedContent(SQLModel, table=True):
     """Content extracted from bookmark URL with 24-hour filtering applied"""
 
     __tablename__ = "extracted_contents"  # type: ignore[assignment]
+    __mapper_args__ = {
+        "properties": {
+            "raw_content": deferred(_RAW_CONTENT_COLUMN),
+            "filtered_content": deferred(_FILTERED_CONTENT_COLUMN),
+        }
+    }
 
     id: Optional[int] = Field(default=None, primary_key=True)
     bookmark_id: int = Field(foreign_key="bookmarks.id", unique=True)
-    extraction_time: datetime = Field(default_factory=datetime.utcnow)
+    extraction_time: Optional[datetime] = _created_at_field("When the content was extracted")
     page_title: Optional[str] = Field(default=None, max_length=500)
     page_url: str = Field(max_length=2000, description="Final URL after redirects")
-    raw_content: str = Field(description="Raw extracted content from page")
-    filtered_content: Optional[str] = Field(default=None, description="Content filtered to last 24 hours")
+    raw_content: str = Field(sa_column=_RAW_CONTENT_COLUMN, description="Raw extracted content from page")
+    filtered_content: Optional[str] = Field(
+        default=None, sa_column=_FILTERED_CONTENT_COLUMN, description="Content filtered to last 24 hours"
+    )
     content_date: Optional[datetime] = Field(default=None, description="Latest content date found on page")
     content_metadata: Dict[str, Any] = Field(
-        default={}, sa_column=Column(JSON), description="Metadata about content extraction"
+        default={}, sa_column=Column(_JSON_TYPE), description="Metadata about content extraction"
     )
     has_recent_content: bool = Field(default=False, description="Whether page contains content from last 24 hours")
     content_summary: Optional[str] = Field(default=None, max_length=2000, description="AI-generated summary nugget")
-    summary_generated_at: Optional[datetime] = Field(default=None)
+    summary_generated_at: Optional[datetime] = _timestamp_field()
     extraction_method: str = Field(max_length=100, description="Method used for content extraction")
-    page_load_time: Optional[Decimal] = Field(default=None, description="Time taken to load page in seconds")
+    page_load_time: Optional[float] = Field(
+        default=None, sa_type=Double, description="Time taken to load page in seconds"
+    )
+    content_sha256: Optional[bytes] = Field(
+        default=None,
+        sa_type=LargeBinary(32),  # type: ignore[arg-type]
+        index=True,
+        description="SHA-256 of raw_content, for reusing summaries",
+    )
 
     bookmark: Bookmark = Relationship(back_populates="extracted_content")
 
@@ -100,16 +193,25 @@ class SummaryJob(SQLModel, table=True):
     """Job for generating final summary from all bookmark summaries"""
 
     __tablename__ = "summary_jobs"  # type: ignore[assignment]
+    __mapper_args__ = {"properties": {"final_summary": deferred(_FINAL_SUMMARY_COLUMN)}}
+    __table_args__ = (
+        Index("ix_summary_jobs_open", "upload_id", postgresql_where=text("status IN ('pending', 'processing')")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     upload_id: int = Field(foreign_key="bookmark_uploads.id")
-    status: SummaryJobStatus = Field(default=SummaryJobStatus.PENDING)
-    started_at: Optional[datetime] = Field(default=None)
-    completed_at: Optional[datetime] = Field(default=None)
+    status: SummaryJobStatus = Field(
+        default=SummaryJobStatus.PENDING,
+        sa_type=_status_column_type(SummaryJobStatus),  # type: ignore[arg-type]
+    )
+    started_at: Optional[datetime] = _timestamp_field()
+    completed_at: Optional[datetime] = _timestamp_field()
     bookmarks_included: int = Field(default=0, description="Number of bookmarks with summaries included")
-    final_summary: Optional[str] = Field(default=None, description="Final consolidated summary")
+    final_summary: Optional[str] = Field(
+        default=None, sa_column=_FINAL_SUMMARY_COLUMN, description="Final consolidated summary"
+    )
     summary_metadata: Dict[str, Any] = Field(
-        default={}, sa_column=Column(JSON), description="Metadata about summary generation"
+        default={}, sa_column=Column(_JSON_TYPE), description="Metadata about summary generation"
     )
     error_message: Optional[str] = Field(default=None, max_length=1000)
     llm_model_used: Optional[str] = Field(
@@ -124,15 +226,18 @@ class ProcessingLog(SQLModel, table=True):
     """Audit log for tracking processing steps and performance"""
 
     __tablename__ = "processing_logs"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_plog_upload_ts", "upload_id", "timestamp"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: Optional[datetime] = _created_at_field("When the operation was logged")
     upload_id: Optional[int] = Field(default=None, foreign_key="bookmark_uploads.id")
     bookmark_id: Optional[int] = Field(default=None, foreign_key="bookmarks.id")
     operation: str = Field(max_length=100, description="Operation being performed")
     status: str = Field(max_length=50, description="Operation status")
-    duration_seconds: Optional[Decimal] = Field(default=None, description="Time taken for operation")
-    details: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="Additional operation details")
+    duration_seconds: Optional[float] = Field(default=None, sa_type=Double, description="Time taken for operation")
+    details: Dict[str, Any] = Field(
+        default={}, sa_column=Column(_JSON_TYPE), description="Additional operation details"
+    )
     error_details: Optional[str] = Field(default=None, max_length=2000)
 
 
@@ -161,7 +266,7 @@ class ExtractedContentCreate(SQLModel, table=False):
     content_metadata: Dict[str, Any] = Field(default={})
     has_recent_content: bool = Field(default=False)
     extraction_method: str = Field(max_length=100)
-    page_load_time: Optional[Decimal] = Field(default=None)
+    page_load_time: Optional[float] = Field(default=None)
 
 
 class ContentSummaryUpdate(SQLModel, table=False):
@@ -188,7 +293,7 @@ class ProcessingLogCreate(SQLModel, table=False):
     bookmark_id: Optional[int] = Field(default=None)
     operation: str = Field(max_length=100)
     status: str = Field(max_length=50)
-    duration_seconds: Optional[Decimal] = Field(default=None)
+    duration_seconds: Optional[float] = Field(default=None)
     details: Dict[str, Any] = Field(default={})
     error_details: Optional[str] = Field(default=None)
 
@@ -217,5 +322,6 @@ class UploadSummaryResponse(SQLModel, table=False):
     bookmarks_with_summaries: int
     final_summary: Optional[str] = Field(default=None)
     processing_time_seconds: Optional[int] = Field(default=None)
-    upload_time: str  # ISO format datetime string
-    processing_completed_at: Optional[str] = Field(default=None)  # ISO format datetime string
+    # Kept as datetimes; pydantic's serializer renders ISO strings once, at response serialization time
+    upload_time: datetime
+    processing_completed_at: Optional[datetime] = Field(default=None)
@@ -0,0 +1,120 @@
+"""Read-side queries that assemble upload and bookmark responses"""
+
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, undefer
+from sqlmodel import Session, func, select
+
+from app.models import (
+    Bookmark,
+    BookmarkSummaryResponse,
+    BookmarkUpload,
+    ExtractedContent,
+    SummaryJob,
+    SummaryJobStatus,
+    UploadSummaryResponse,
+)
+
+
+def _bookmark_response(bookmark: Bookmark) -> Optional[BookmarkSummaryResponse]:
+    if bookmark.id is None:
+        return None
+    content = bookmark.extracted_content
+    return BookmarkSummaryResponse(
+        bookmark_id=bookmark.id,
+        title=bookmark.title,
+        url=bookmark.url,
+        status=bookmark.processing_status,
+        has_recent_content=content.has_recent_content if content is not None else False,
+        content_summary=content.content_summary if content is not None else None,
+        error_message=bookmark.error_message,
+    )
+
+
+def get_upload_summary(session: Session, upload_id: int) -> Optional[UploadSummaryResponse]:
+    """Build the summary response for an upload.
+
+    Summarized bookmarks are counted in SQL and only the latest completed summary job is loaded, so the
+    response costs a fixed number of queries and never materializes the upload's bookmarks.
+    """
+    upload = session.get(BookmarkUpload, upload_id)
+    # id and upload_time are database-generated, so a loaded row always has both
+    if upload is None or upload.id is None or upload.upload_time is None:
+        return None
+
+    bookmarks_with_summaries = session.exec(
+        select(func.count())
+        .select_from(Bookmark)
+        .join(ExtractedContent, ExtractedContent.bookmark_id == Bookmark.id)  # type: ignore[arg-type]
+        .where(Bookmark.upload_id == upload_id, ExtractedContent.content_summary.is_not(None))  # type: ignore[union-attr]
+    ).one()
+
+    # final_summary is deferred on the mapper; load it for this one job only
+    latest_job = session.exec(
+        select(SummaryJob)
+        .where(SummaryJob.upload_id == upload_id, SummaryJob.status == SummaryJobStatus.COMPLETED)
+        .order_by(SummaryJob.id.desc())  # type: ignore[union-attr]
+        .limit(1)
+        .options(undefer(SummaryJob.final_summary))  # type: ignore[arg-type]
+    ).first()
+
+    processing_time_seconds = None
+    if upload.processing_started_at is not None and upload.processing_completed_at is not None:
+        processing_time_seconds = int((upload.processing_completed_at - upload.processing_started_at).total_seconds())
+
+    return UploadSummaryResponse(
+        upload_id=upload.id,
+        filename=upload.filename,
+        status=upload.processing_status,
+        total_bookmarks=upload.total_bookmarks,
+        processed_bookmarks=upload.processed_bookmarks,
+        bookmarks_with_summaries=bookmarks_with_summaries,
+        final_summary=latest_job.final_summary if latest_job is not None else None,
+        processing_time_seconds=processing_time_seconds,
+        upload_time=upload.upload_time,
+        processing_completed_at=upload.processing_completed_at,
+    )
+
+
+def get_upload_bookmarks(session: Session, upload_id: int) -> list[BookmarkSummaryResponse]:
+    """List per-bookmark results of an upload.
+
+    Selects only the response columns in one outer join, without loading ORM entities, and builds
+    responses with model_construct since every value comes straight from typed database columns.
+    """
+    rows = session.exec(
+        select(  # type: ignore[call-overload]
+            Bookmark.id,
+            Bookmark.title,
+            Bookmark.url,
+            Bookmark.processing_status,
+            Bookmark.error_message,
+            ExtractedContent.has_recent_content,
+            ExtractedContent.content_summary,
+        )
+        .outerjoin(ExtractedContent, ExtractedContent.bookmark_id == Bookmark.id)  # type: ignore[arg-type]
+        .where(Bookmark.upload_id == upload_id)
+        .order_by(Bookmark.id)  # type: ignore[arg-type]
+    ).all()
+    return [
+        BookmarkSummaryResponse.model_construct(
+            bookmark_id=bookmark_id,
+            title=title,
+            url=url,
+            status=status,
+            has_recent_content=bool(has_recent_content),
+            content_summary=content_summary,
+            error_message=error_message,
+        )
+        for bookmark_id, title, url, status, error_message, has_recent_content, content_summary in rows
+    ]
+
+
+def get_bookmark_detail(session: Session, bookmark_id: int) -> Optional[BookmarkSummaryResponse]:
+    """Load a single bookmark together with its extracted content in one joined query"""
+    bookmark = session.exec(
+        select(Bookmark).where(Bookmark.id == bookmark_id).options(joinedload(Bookmark.extracted_content))  # type: ignore[arg-type]
+    ).first()
+    if bookmark is None:
+        return None
+    return _bookmark_response(bookmark)
@@ -1,5 +1,7 @@
 import logging
 import os
+from app.bookmark_processor import recover_interrupted_uploads
+from app.logging_queue import start_log_flusher, stop_log_flusher
 from app.startup import startup
 from nicegui import app, ui
 from fastapi import FastAPI
@@ -30,6 +32,9 @@ async def health():
 logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 
 app.on_startup(startup)
+app.on_startup(recover_interrupted_uploads)
+app.on_startup(start_log_flusher)
+app.on_shutdown(stop_log_flusher)
 
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
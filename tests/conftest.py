@@ -1,5 +1,7 @@
 from typing import Generator
 import pytest
+from app.database import get_session, reset_db
+from app.models import BookmarkUpload
 from app.startup import startup
 from nicegui.testing import User
 
@@ -10,3 +12,23 @@ pytest_plugins = ["nicegui.testing.plugin"]
 def user(user: User) -> Generator[User, None, None]:
     startup()
     yield user
+
+
+@pytest.fixture()
+def clean_db() -> Generator[None, None, None]:
+    """Reset database for each test"""
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def upload_id(clean_db) -> int:
+    """Id of a freshly stored upload with no bookmarks"""
+    with get_session() as session:
+        upload = BookmarkUpload(filename="Bookmarks.html", file_path="/tmp/Bookmarks.html", file_size=1024)
+        session.add(upload)
+        session.commit()
+        session.refresh(upload)
+        assert upload.id is not None
+        return upload.id
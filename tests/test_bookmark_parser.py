@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlmodel import select
+
+from app.bookmark_parser import URL_MAX_LENGTH, import_upload, parse_bookmarks_html
+from app.database import get_session
+from app.models import Bookmark, BookmarkUpload
+
+SAFARI_EXPORT = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<HTML>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<Title>Bookmarks</Title>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 FOLDED>Favorites</H3>
+    <DL><p>
+        <DT><A HREF="https://news.ycombinator.com/" ADD_DATE="1700000000">Hacker News</A>
+        <DT><H3 FOLDED>Dev &amp; Tools</H3>
+        <DL><p>
+            <DT><A HREF="https://docs.python.org/3/">Python   docs</A>
+        </DL><p>
+    </DL><p>
+    <DT><A HREF="https://example.com/untitled"></A>
+    <DT><A HREF="javascript:alert(1)">Bookmarklet</A>
+</DL><p>
+</HTML>
+"""
+
+
+def test_parse_bookmarks_html_folders_and_titles():
+    bookmarks = parse_bookmarks_html(SAFARI_EXPORT)
+
+    assert list(zip(bookmarks.titles, bookmarks.urls, bookmarks.folder_paths)) == [
+        ("Hacker News", "https://news.ycombinator.com/", "Favorites"),
+        ("Python docs", "https://docs.python.org/3/", "Favorites > Dev & Tools"),
+        ("https://example.com/untitled", "https://example.com/untitled", None),
+    ]
+    assert bookmarks.dates_added == [datetime.fromtimestamp(1700000000, timezone.utc).replace(tzinfo=None), None, None]
+
+
+def test_parse_bookmarks_html_truncates_long_values():
+    long_url = "https://example.com/" + "a" * 3000
+    html = f'<DL><p><DT><A HREF="{long_url}">{"t" * 900}</A></DL>'
+
+    bookmarks = parse_bookmarks_html(html)
+
+    assert len(bookmarks) == 1
+    assert len(bookmarks.urls[0]) == URL_MAX_LENGTH
+    assert len(bookmarks.titles[0]) == 500
+
+
+def test_parse_bookmarks_html_empty():
+    assert len(parse_bookmarks_html("")) == 0
+
+
+@pytest.mark.sqlmodel
+def test_import_upload_inserts_parsed_bookmarks_once(upload_id: int, tmp_path: Path):
+    export = tmp_path / "Bookmarks.html"
+    export.write_text(SAFARI_EXPORT, encoding="utf-8")
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        upload.file_path = str(export)
+        session.add(upload)
+        session.commit()
+
+    assert import_upload(upload_id) == 3
+    # Re-importing the same file inserts nothing and keeps the count
+    assert import_upload(upload_id) == 0
+
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        assert upload.total_bookmarks == 3
+        rows = session.exec(
+            select(Bookmark.title, Bookmark.folder_path, Bookmark.date_added).order_by(Bookmark.id)  # type: ignore[arg-type]
+        ).all()
+        assert [tuple(row) for row in rows] == [
+            ("Hacker News", "Favorites", datetime.fromtimestamp(1700000000, timezone.utc).replace(tzinfo=None)),
+            ("Python docs", "Favorites > Dev & Tools", None),
+            ("https://example.com/untitled", None, None),
+        ]
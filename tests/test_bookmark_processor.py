@@ -0,0 +1,249 @@
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+
+from app.bookmark_processor import (
+    filter_recent_content,
+    process_one,
+    process_upload,
+    recover_interrupted_uploads,
+    summarize_content,
+)
+from app.bulk import bulk_retry
+from app.database import get_session
+from app.models import Bookmark, BookmarkStatus, BookmarkUpload, ContentExtractionStatus, ExtractedContent
+
+
+def _page(text: str) -> str:
+    return f"<html><head><title>Daily</title></head><body><p>{text}</p></body></html>"
+
+
+def _site(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/missing":
+        return httpx.Response(404)
+    if request.url.path == "/nul":
+        return httpx.Response(200, html="<html><title>Da\x00ily</title><p>Text\x00 with NUL.</p></html>")
+    if request.url.path == "/archive.zip":
+        return httpx.Response(200, headers={"content-type": "application/zip"}, content=b"PK\x03\x04")
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text=_page(f"News {today}."))
+
+
+def test_filter_recent_content_keeps_recent_blocks():
+    now = datetime(2025, 6, 2, 12, 0)
+    blocks = ["Archive post from 2024-01-01", "Release notes 2025-06-02 with fixes", "About us"]
+
+    filtered, content_date = filter_recent_content(blocks, [], now)
+
+    assert filtered == "Release notes 2025-06-02 with fixes"
+    assert content_date == datetime(2025, 6, 2)
+
+
+def test_filter_recent_content_without_recent_dates():
+    now = datetime(2025, 6, 2, 12, 0)
+
+    filtered, content_date = filter_recent_content(["Old 2020-02-02", "No date"], ["2021-03-04T10:00"], now)
+
+    assert filtered is None
+    assert content_date == datetime(2021, 3, 4, 10, 0)
+
+
+def test_filter_recent_content_uses_page_time_when_blocks_undated():
+    now = datetime(2025, 6, 2, 12, 0)
+
+    filtered, _ = filter_recent_content(["Headline", "Body text"], ["2025-06-02T08:30:00Z"], now)
+
+    assert filtered == "Headline\nBody text"
+
+
+def test_summarize_content_is_bounded():
+    text = "First sentence. " * 500
+
+    summary = summarize_content(text, max_length=200)
+
+    assert summary.startswith("First sentence.")
+    assert len(summary) <= 200
+
+
+async def test_process_one_reports_failures_instead_of_raising():
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_site)) as client:
+        results = [
+            await process_one(client, 1, "https://[::1/"),
+            await process_one(client, 2, "https://example.com/missing"),
+            await process_one(client, 3, "https://example.com/archive.zip"),
+        ]
+
+    assert [content for _, content, _, _ in results] == [None, None, None]
+    assert all(error for _, _, error, _ in results)
+    assert "application/zip" in (results[2][2] or "")
+
+
+async def test_process_one_truncates_large_pages():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, html=_page("x" * 10_000)))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        _, content, error, _ = await process_one(client, 1, "https://example.com/huge", max_bytes=100)
+
+    assert error is None
+    assert content is not None
+    assert content.content_metadata["truncated"]
+    assert len(content.raw_content) < 100
+
+
+@pytest.mark.sqlmodel
+async def test_process_upload_records_successes_and_failures(upload_id: int):
+    urls = [
+        "https://example.com/a",
+        "https://example.com/b",
+        "https://example.com/missing",
+        "https://example.com/archive.zip",
+        "https://[::1/",
+    ]
+    with get_session() as session:
+        session.add_all(Bookmark(upload_id=upload_id, title=url, url=url) for url in urls)
+        session.commit()
+
+    processed = await process_upload(upload_id, concurrency=2, transport=httpx.MockTransport(_site))
+
+    assert processed == len(urls)
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        assert upload.processing_status == BookmarkStatus.COMPLETED
+        assert upload.processed_bookmarks == len(urls)
+
+        statuses = dict(session.exec(select(Bookmark.url, Bookmark.processing_status)).all())
+        assert statuses == {
+            "https://example.com/a": ContentExtractionStatus.COMPLETED,
+            "https://example.com/b": ContentExtractionStatus.COMPLETED,
+            "https://example.com/missing": ContentExtractionStatus.FAILED,
+            "https://example.com/archive.zip": ContentExtractionStatus.FAILED,
+            "https://[::1/": ContentExtractionStatus.FAILED,
+        }
+        summaries = session.exec(select(ExtractedContent.content_summary)).all()
+        assert len(summaries) == 2
+        assert all(summary and summary.startswith("News") for summary in summaries)
+
+
+@pytest.mark.sqlmodel
+async def test_retried_bookmarks_are_not_counted_twice(upload_id: int):
+    urls = ["https://example.com/a", "https://example.com/missing"]
+    with get_session() as session:
+        session.add_all(Bookmark(upload_id=upload_id, title=url, url=url) for url in urls)
+        session.commit()
+    await process_upload(upload_id, transport=httpx.MockTransport(_site))
+
+    with get_session() as session:
+        failed_ids = session.exec(
+            select(Bookmark.id).where(Bookmark.processing_status == ContentExtractionStatus.FAILED)
+        ).all()
+        assert bulk_retry(session, [bookmark_id for bookmark_id in failed_ids if bookmark_id is not None]) == 1
+        session.commit()
+    assert await process_upload(upload_id, transport=httpx.MockTransport(_site)) == 1
+
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        assert upload.processed_bookmarks == len(urls)
+
+
+@pytest.mark.sqlmodel
+async def test_process_upload_refuses_running_upload_until_recovered(upload_id: int):
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        upload.processing_status = BookmarkStatus.PROCESSING
+        bookmark = Bookmark(
+            upload_id=upload_id,
+            title="In flight",
+            url="https://example.com/a",
+            processing_status=ContentExtractionStatus.EXTRACTING,
+        )
+        session.add_all([upload, bookmark])
+        session.commit()
+
+    with pytest.raises(ValueError):
+        await process_upload(upload_id, transport=httpx.MockTransport(_site))
+    with get_session() as session:
+        # The other run's in-flight bookmark is left alone
+        assert session.exec(select(Bookmark.processing_status)).one() == ContentExtractionStatus.EXTRACTING
+
+    assert recover_interrupted_uploads() == 1
+    assert await process_upload(upload_id, transport=httpx.MockTransport(_site)) == 1
+    with get_session() as session:
+        assert session.exec(select(Bookmark.processing_status)).one() == ContentExtractionStatus.COMPLETED
+
+
+@pytest.mark.sqlmodel
+async def test_identical_pages_are_summarized_once(upload_id: int):
+    calls: list[str] = []
+
+    def counting_summarize(text: str, max_length: int = 2000) -> str:
+        calls.append(text)
+        return summarize_content(text, max_length)
+
+    with get_session() as session:
+        second_upload = BookmarkUpload(filename="Later.html", file_path="/tmp/Later.html", file_size=512)
+        session.add(second_upload)
+        session.commit()
+        assert second_upload.id is not None
+        second_upload_id = second_upload.id
+        # Same page content behind different URLs: a duplicate within one batch and one in a later upload
+        session.add_all(
+            [
+                Bookmark(upload_id=upload_id, title="A", url="https://example.com/a"),
+                Bookmark(upload_id=upload_id, title="B", url="https://example.com/b"),
+                Bookmark(upload_id=second_upload_id, title="C", url="https://example.com/c"),
+            ]
+        )
+        session.commit()
+
+    transport = httpx.MockTransport(_site)
+    assert await process_upload(upload_id, transport=transport, summarize=counting_summarize) == 2
+    assert await process_upload(second_upload_id, transport=transport, summarize=counting_summarize) == 1
+
+    assert len(calls) == 1
+    with get_session() as session:
+        summaries = session.exec(select(ExtractedContent.content_summary)).all()
+        assert len(summaries) == 3
+        assert len(set(summaries)) == 1
+
+
+@pytest.mark.sqlmodel
+async def test_process_upload_strips_nul_characters(upload_id: int):
+    with get_session() as session:
+        session.add(Bookmark(upload_id=upload_id, title="NUL", url="https://example.com/nul"))
+        session.commit()
+
+    assert await process_upload(upload_id, transport=httpx.MockTransport(_site)) == 1
+
+    with get_session() as session:
+        content = session.exec(select(ExtractedContent)).one()
+        assert content.page_title == "Daily"
+        assert content.raw_content == "Text with NUL."
+
+
+@pytest.mark.sqlmodel
+async def test_process_upload_requeues_bookmarks_when_a_write_fails(upload_id: int):
+    with get_session() as session:
+        session.add_all(Bookmark(upload_id=upload_id, title=path, url=f"https://example.com/{path}") for path in "ab")
+        session.commit()
+
+    # Longer than the content_summary column, so the database rejects the batch
+    with pytest.raises(DBAPIError):
+        await process_upload(upload_id, transport=httpx.MockTransport(_site), summarize=lambda text: "x" * 3000)
+
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, upload_id)
+        assert upload is not None
+        assert upload.processing_status == BookmarkStatus.FAILED
+        assert upload.error_message
+        assert upload.processed_bookmarks == 0
+        assert set(session.exec(select(Bookmark.processing_status)).all()) == {ContentExtractionStatus.PENDING}
+        assert session.exec(select(ExtractedContent.id)).all() == []
+
+    # The failed upload is not stuck: a later run picks its bookmarks up again
+    assert await process_upload(upload_id, transport=httpx.MockTransport(_site)) == 2
@@ -0,0 +1,135 @@
+"""Tests for bulk write helpers (require PostgreSQL)."""
+
+import pytest
+from sqlmodel import Session, func, select
+
+from app.bulk import (
+    COPY_THRESHOLD,
+    bulk_create_bookmark_columns,
+    bulk_retry,
+    bulk_write_processing_logs,
+    reset_stale_bookmarks,
+)
+from app.database import get_session
+from app.models import (
+    Bookmark,
+    ContentExtractionStatus,
+    ProcessingLog,
+    ProcessingLogCreate,
+)
+
+
+def _create_columns(session: Session, upload_id: int, urls: list[str], batch_size: int = 1000) -> int:
+    return bulk_create_bookmark_columns(
+        session,
+        upload_id,
+        titles=[f"Page {i}" for i in range(len(urls))],
+        urls=urls,
+        folder_paths=["Favorites"] * len(urls),
+        dates_added=[None] * len(urls),
+        batch_size=batch_size,
+    )
+
+
+@pytest.mark.sqlmodel
+def test_bulk_create_bookmark_columns_pages_rows(upload_id: int):
+    with get_session() as session:
+        inserted = _create_columns(session, upload_id, [f"https://example.com/{i}" for i in range(25)], batch_size=10)
+        session.commit()
+
+    assert inserted == 25
+    with get_session() as session:
+        count = session.exec(select(func.count()).select_from(Bookmark).where(Bookmark.upload_id == upload_id)).one()
+        assert count == 25
+
+
+@pytest.mark.sqlmodel
+def test_bulk_create_bookmark_columns_skips_duplicate_urls(upload_id: int):
+    urls = [f"https://example.com/{i % 3}" for i in range(5)]
+
+    with get_session() as session:
+        assert _create_columns(session, upload_id, urls) == 3
+        # Re-importing the same rows is a no-op
+        assert _create_columns(session, upload_id, urls) == 0
+        session.commit()
+
+    with get_session() as session:
+        count = session.exec(select(func.count()).select_from(Bookmark).where(Bookmark.upload_id == upload_id)).one()
+        assert count == 3
+
+
+@pytest.mark.sqlmodel
+def test_bulk_create_bookmark_columns_long_non_ascii_urls(upload_id: int):
+    # ~6 KB of varied three-byte characters: too large, even compressed, for a btree entry on the url itself
+    base = "https://example.com/" + "".join(chr(0x4E00 + i * 7919 % 20000) for i in range(1979))
+    urls = [base + "a", base + "b", base + "a"]
+
+    with get_session() as session:
+        assert _create_columns(session, upload_id, urls) == 2
+        session.commit()
+
+
+@pytest.mark.sqlmodel
+def test_bulk_create_bookmark_columns_empty(upload_id: int):
+    with get_session() as session:
+        assert _create_columns(session, upload_id, []) == 0
+
+
+@pytest.mark.sqlmodel
+@pytest.mark.parametrize("row_count", [3, COPY_THRESHOLD + 5])
+def test_bulk_write_processing_logs(upload_id: int, row_count: int):
+    rows = [
+        ProcessingLogCreate(
+            upload_id=upload_id,
+            operation="extract",
+            status="completed" if i % 2 else "failed",
+            details={"attempt": i, "note": 'tab\there, "quoted"\nnewline'},
+            error_details=None if i % 2 else "",
+        )
+        for i in range(row_count)
+    ]
+
+    with get_session() as session:
+        assert bulk_write_processing_logs(session, rows) == row_count
+        session.commit()
+
+    with get_session() as session:
+        logs = session.exec(select(ProcessingLog).order_by(ProcessingLog.id)).all()  # type: ignore[arg-type]
+        assert len(logs) == row_count
+        assert logs[0].details == {"attempt": 0, "note": 'tab\there, "quoted"\nnewline'}
+        assert logs[0].error_details == ""
+        assert logs[1].error_details is None
+        assert all(log.timestamp is not None for log in logs)
+
+
+@pytest.mark.sqlmodel
+def test_bulk_retry_and_reset_stale(upload_id: int):
+    statuses = [
+        ContentExtractionStatus.FAILED,
+        ContentExtractionStatus.FAILED,
+        ContentExtractionStatus.COMPLETED,
+        ContentExtractionStatus.EXTRACTING,
+    ]
+    with get_session() as session:
+        bookmarks = [
+            Bookmark(upload_id=upload_id, title=f"Page {i}", url=f"https://example.com/{i}", processing_status=status)
+            for i, status in enumerate(statuses)
+        ]
+        session.add_all(bookmarks)
+        session.commit()
+        ids = [bookmark.id for bookmark in bookmarks if bookmark.id is not None]
+
+    with get_session() as session:
+        assert bulk_retry(session, ids[:3]) == 2
+        assert reset_stale_bookmarks(session, upload_id) == 1
+        session.commit()
+
+    with get_session() as session:
+        rows = session.exec(select(Bookmark).order_by(Bookmark.id)).all()  # type: ignore[arg-type]
+        assert [row.processing_status for row in rows] == [
+            ContentExtractionStatus.PENDING,
+            ContentExtractionStatus.PENDING,
+            ContentExtractionStatus.COMPLETED,
+            ContentExtractionStatus.PENDING,
+        ]
+        assert [row.retry_count for row in rows] == [1, 1, 0, 0]
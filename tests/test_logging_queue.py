@@ -0,0 +1,94 @@
+"""Tests for the background processing log flusher (require PostgreSQL)."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlmodel import func, select
+
+from app.bulk import COPY_THRESHOLD
+from app.database import get_session
+from app.logging_queue import enqueue_processing_log, flush_pending_logs, log_flusher
+from app.models import ProcessingLog, ProcessingLogCreate
+
+
+@pytest.fixture()
+def log_queue() -> asyncio.Queue[ProcessingLogCreate]:
+    # A fresh queue per test: asyncio.Queue binds to the event loop that first waits on it
+    return asyncio.Queue()
+
+
+def _log_count() -> int:
+    with get_session() as session:
+        return session.exec(select(func.count()).select_from(ProcessingLog)).one()
+
+
+def _enqueue(queue: asyncio.Queue[ProcessingLogCreate], upload_id: int, count: int) -> None:
+    for _ in range(count):
+        queue.put_nowait(ProcessingLogCreate(upload_id=upload_id, operation="extract", status="completed"))
+
+
+async def _wait_for_log_count(expected: int) -> None:
+    for _ in range(100):
+        if _log_count() == expected:
+            return
+        await asyncio.sleep(0.05)
+    pytest.fail(f"Expected {expected} processing logs, found {_log_count()}")
+
+
+@pytest.mark.sqlmodel
+def test_flush_pending_logs_writes_queued_entries(upload_id: int, log_queue: asyncio.Queue[ProcessingLogCreate]):
+    _enqueue(log_queue, upload_id, 3)
+
+    assert flush_pending_logs(get_session, log_queue) == 3
+    assert flush_pending_logs(get_session, log_queue) == 0
+    assert _log_count() == 3
+
+
+@pytest.mark.sqlmodel
+async def test_flush_pending_logs_includes_entries_held_by_flusher(
+    upload_id: int, log_queue: asyncio.Queue[ProcessingLogCreate]
+):
+    _enqueue(log_queue, upload_id, 2)
+
+    flusher = asyncio.create_task(log_flusher(get_session, log_queue, interval=10.0))
+    await asyncio.sleep(0.1)
+    # Both entries are off the queue and the flusher is waiting for its interval to end
+    assert log_queue.empty()
+    flusher.cancel()
+
+    assert flush_pending_logs(get_session, log_queue) == 2
+    assert _log_count() == 2
+
+
+@pytest.mark.sqlmodel
+async def test_log_flusher_survives_failed_copy(upload_id: int, log_queue: asyncio.Queue[ProcessingLogCreate]):
+    flusher = asyncio.create_task(log_flusher(get_session, log_queue, interval=0.05))
+    try:
+        # Large enough for COPY, whose foreign key violation surfaces as a raw psycopg2 error
+        _enqueue(log_queue, upload_id + 1000, COPY_THRESHOLD + 1)
+        await asyncio.sleep(0.5)
+
+        _enqueue(log_queue, upload_id, 2)
+        await _wait_for_log_count(2)
+        assert not flusher.done()
+    finally:
+        flusher.cancel()
+    assert flush_pending_logs(get_session, log_queue) == 0
+
+
+@pytest.mark.sqlmodel
+def test_unserializable_details_are_stored_as_strings(upload_id: int, log_queue: asyncio.Queue[ProcessingLogCreate]):
+    # Large enough for COPY, which serializes details itself
+    for _ in range(COPY_THRESHOLD + 1):
+        enqueue_processing_log(
+            ProcessingLogCreate(
+                upload_id=upload_id, operation="summarize", status="completed", details={"score": Decimal("0.75")}
+            ),
+            log_queue,
+        )
+
+    assert flush_pending_logs(get_session, log_queue) == COPY_THRESHOLD + 1
+    with get_session() as session:
+        details = session.exec(select(ProcessingLog.details).distinct()).all()
+    assert details == [{"score": "0.75"}]
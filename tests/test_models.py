@@ -0,0 +1,50 @@
+"""Tests for model column mapping (require PostgreSQL)."""
+
+import pytest
+from sqlalchemy import insert
+from sqlmodel import select, text
+
+from app.database import get_session
+from app.models import Bookmark, ExtractedContent
+
+
+@pytest.mark.sqlmodel
+def test_raw_content_is_compressed_and_deferred(upload_id: int):
+    page_text = "Release notes for the latest version. " * 200
+    with get_session() as session:
+        bookmarks = [Bookmark(upload_id=upload_id, title=name, url=f"https://example.com/{name}") for name in "ab"]
+        session.add_all(bookmarks)
+        session.flush()
+        orm_bookmark_id, core_bookmark_id = (bookmark.id for bookmark in bookmarks)
+        assert orm_bookmark_id is not None and core_bookmark_id is not None
+        session.add(
+            ExtractedContent(
+                bookmark_id=orm_bookmark_id,
+                page_url="https://example.com/a",
+                raw_content=page_text,
+                extraction_method="orm",
+            )
+        )
+        session.execute(
+            insert(ExtractedContent),
+            [
+                {
+                    "bookmark_id": core_bookmark_id,
+                    "page_url": "https://example.com/b",
+                    "raw_content": page_text,
+                    "extraction_method": "core",
+                }
+            ],
+        )
+        session.commit()
+
+    with get_session() as session:
+        stored_sizes = session.exec(text("SELECT octet_length(raw_content_zlib) FROM extracted_contents")).all()  # type: ignore[call-overload]
+        assert all(size < len(page_text) for (size,) in stored_sizes)
+
+        contents = session.exec(select(ExtractedContent).order_by(ExtractedContent.id)).all()  # type: ignore[arg-type]
+        assert len(contents) == 2
+        assert all("raw_content" not in content.__dict__ for content in contents)
+        assert all("filtered_content" not in content.__dict__ for content in contents)
+        # First access loads and decompresses the deferred column
+        assert [content.raw_content for content in contents] == [page_text, page_text]
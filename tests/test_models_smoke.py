@@ -1,11 +1,14 @@
 """Smoke test for SQLModel database setup."""
 
 import pytest
+from sqlalchemy import inspect
 from sqlmodel import SQLModel, text
 import os
+from typing import Optional
 
-from app.database import create_tables, ENGINE
+from app.database import create_tables, ENGINE, get_session
 from app import models
+from app.models import Bookmark
 
 
 @pytest.mark.sqlmodel
@@ -28,6 +31,64 @@ def test_sqlmodel_smoke():
         assert table_name in db_tables, f"Table '{table_name}' not found in database"
 
 
+def _index_names(table_name: str) -> set[Optional[str]]:
+    with ENGINE.connect() as conn:
+        return {index["name"] for index in inspect(conn).get_indexes(table_name)}
+
+
+@pytest.mark.sqlmodel
+def test_create_tables_adds_missing_indexes():
+    create_tables()
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP INDEX uq_bm_upload_url_md5"))
+
+    create_tables()
+
+    assert "uq_bm_upload_url_md5" in _index_names("bookmarks")
+
+
+@pytest.mark.sqlmodel
+def test_create_tables_skips_unique_index_violated_by_existing_rows(upload_id: int):
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP INDEX uq_bm_upload_url_md5"))
+    with get_session() as session:
+        session.add_all(Bookmark(upload_id=upload_id, title="Twice", url="https://example.com/") for _ in range(2))
+        session.commit()
+
+    create_tables()
+
+    assert "uq_bm_upload_url_md5" not in _index_names("bookmarks")
+    assert "ix_bookmarks_pending" in _index_names("bookmarks")
+
+
+@pytest.mark.sqlmodel
+def test_create_tables_skips_indexes_on_unmigrated_columns(clean_db):
+    # An older schema: native ENUM status and no content hash column
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP INDEX ix_bookmarks_pending"))
+        conn.execute(text("DROP INDEX uq_bm_upload_url_md5"))
+        conn.execute(text("CREATE TYPE legacystatus AS ENUM ('PENDING', 'COMPLETED', 'FAILED')"))
+        conn.execute(
+            text(
+                "ALTER TABLE bookmarks ALTER COLUMN processing_status TYPE legacystatus"
+                " USING upper(processing_status)::legacystatus"
+            )
+        )
+        conn.execute(text("ALTER TABLE extracted_contents DROP COLUMN content_sha256"))
+    try:
+        create_tables()
+
+        bookmark_indexes = _index_names("bookmarks")
+        assert "ix_bookmarks_pending" not in bookmark_indexes
+        assert "ix_extracted_contents_content_sha256" not in _index_names("extracted_contents")
+        # Indexes on migrated columns are still added
+        assert "uq_bm_upload_url_md5" in bookmark_indexes
+    finally:
+        with ENGINE.begin() as conn:
+            conn.execute(text("DROP TABLE bookmarks CASCADE"))
+            conn.execute(text("DROP TYPE legacystatus"))
+
+
 DATABRICKS_HOST = os.environ.get("DATABRICKS_HOST")
 DATABRICKS_TOKEN = os.environ.get("DATABRICKS_TOKEN")
 
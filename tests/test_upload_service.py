@@ -0,0 +1,122 @@
+"""Tests for upload response assembly (require PostgreSQL)."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import select
+
+from app.database import get_session
+from app.models import (
+    Bookmark,
+    BookmarkUpload,
+    ContentExtractionStatus,
+    ExtractedContent,
+    SummaryJob,
+    SummaryJobStatus,
+)
+from app.upload_service import get_bookmark_detail, get_upload_bookmarks, get_upload_summary
+
+
+@pytest.fixture()
+def summarized_upload_id(upload_id: int) -> int:
+    with get_session() as session:
+        for i in range(3):
+            bookmark = Bookmark(
+                upload_id=upload_id,
+                title=f"Page {i}",
+                url=f"https://example.com/{i}",
+                processing_status=ContentExtractionStatus.COMPLETED,
+            )
+            session.add(bookmark)
+            session.flush()
+            assert bookmark.id is not None
+            session.add(
+                ExtractedContent(
+                    bookmark_id=bookmark.id,
+                    page_url=bookmark.url,
+                    raw_content="content",
+                    has_recent_content=i != 0,
+                    content_summary=f"Summary {i}" if i != 0 else None,
+                    summary_generated_at=datetime.now(timezone.utc) if i != 0 else None,
+                    extraction_method="test",
+                )
+            )
+        session.commit()
+    return upload_id
+
+
+@pytest.fixture()
+def completed_job_upload_id(summarized_upload_id: int) -> int:
+    statuses = [SummaryJobStatus.COMPLETED, SummaryJobStatus.COMPLETED, SummaryJobStatus.FAILED]
+    with get_session() as session:
+        session.add_all(
+            SummaryJob(
+                upload_id=summarized_upload_id,
+                status=status,
+                bookmarks_included=2,
+                final_summary=f"Final summary {i}" if status == SummaryJobStatus.COMPLETED else None,
+            )
+            for i, status in enumerate(statuses)
+        )
+        session.commit()
+    return summarized_upload_id
+
+
+@pytest.mark.sqlmodel
+def test_get_upload_summary_counts_summaries(summarized_upload_id: int):
+    with get_session() as session:
+        summary = get_upload_summary(session, summarized_upload_id)
+
+    assert summary is not None
+    assert summary.upload_id == summarized_upload_id
+    assert summary.bookmarks_with_summaries == 2
+    assert summary.final_summary is None
+
+
+@pytest.mark.sqlmodel
+def test_get_upload_summary_loads_latest_final_summary(completed_job_upload_id: int):
+    with get_session() as session:
+        job = session.exec(select(SummaryJob).limit(1)).one()
+        assert "final_summary" not in job.__dict__
+
+        summary = get_upload_summary(session, completed_job_upload_id)
+
+    assert summary is not None
+    assert summary.final_summary == "Final summary 1"
+
+
+@pytest.mark.sqlmodel
+def test_get_upload_summary_timestamps_are_comparable(summarized_upload_id: int):
+    started = datetime.now(timezone.utc)
+    with get_session() as session:
+        upload = session.get(BookmarkUpload, summarized_upload_id)
+        assert upload is not None
+        upload.processing_started_at = started
+        upload.processing_completed_at = started + timedelta(seconds=90)
+        session.add(upload)
+        session.commit()
+
+    with get_session() as session:
+        summary = get_upload_summary(session, summarized_upload_id)
+
+    assert summary is not None
+    assert summary.processing_time_seconds == 90
+    assert summary.processing_completed_at is not None
+    assert summary.processing_completed_at - summary.upload_time < timedelta(minutes=5)
+
+
+@pytest.mark.sqlmodel
+def test_get_upload_summary_missing_upload(summarized_upload_id: int):
+    with get_session() as session:
+        assert get_upload_summary(session, summarized_upload_id + 1000) is None
+
+
+@pytest.mark.sqlmodel
+def test_get_upload_bookmarks_and_detail(summarized_upload_id: int):
+    with get_session() as session:
+        bookmarks = get_upload_bookmarks(session, summarized_upload_id)
+        assert [b.content_summary for b in bookmarks] == [None, "Summary 1", "Summary 2"]
+
+        detail = get_bookmark_detail(session, bookmarks[1].bookmark_id)
+        assert detail is not None
+        assert detail.has_recent_content